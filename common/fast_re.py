@@ -0,0 +1,17 @@
+# Regex engine for the parsers' hot paths.
+#
+# Prefers google-re2 (linear-time matching, no backtracking blow-ups on long
+# description lines), then the third-party `regex` module, then stdlib `re`.
+# The engines take flags differently, so patterns compiled here carry them
+# inline, e.g. "(?i)" / "(?im)".
+try:
+    import re2 as _engine
+except ImportError:
+    try:
+        import regex as _engine
+    except ImportError:
+        import re as _engine
+
+
+def compile(pattern: str):
+    return _engine.compile(pattern)
@@ -3,8 +3,7 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import tempfile
 import pandas as pd
-from parsers import get_parser
-from common.bank_detect import detect_bank
+from parsers import parse_statement
 from preview import preview_pdf
 
 app = FastAPI(title="Statement Parser", version="0.5.0")
@@ -29,9 +28,7 @@ async def parse(file: UploadFile, password: str = Form(default=None), bank: str
             tmp.write(contents)
             pdf_path = tmp.name
 
-        bank_guess = bank or (detect_bank(pdf_path, password) or "unknown")
-        parser = get_parser(bank_guess)
-        result = parser(pdf_path, password)
+        result = parse_statement(pdf_path, password, bank)
 
         if isinstance(result, dict) and "error" in result:
             return JSONResponse(content=result, status_code=400)
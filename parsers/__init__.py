@@ -1,10 +1,18 @@
+from common.bank_detect import detect_bank_from_text
+from common.pdf_utils import extract_page_lines
 from .mashreq import parse_mashreq
 from .enbd import parse_enbd
-from .emiratesislamic import parse_emiratesislamic
-from .rakbank import parse_rakbank
+from .emiratesislamic import parse_emiratesislamic, _parse_text as _parse_emiratesislamic_text
+from .rakbank import parse_rakbank, _parse_text as _parse_rakbank_text
 from .generic import parse_generic
 # from .adcb import parse_adcb  # add later
 
+# Parsers that can run on already-extracted page lines (see parse_statement)
+TEXT_PARSERS = {
+    "emiratesislamic": _parse_emiratesislamic_text,
+    "rakbank": _parse_rakbank_text,
+}
+
 def get_parser(bank: str):
     bank = (bank or "").lower()
     if bank == "mashreq":
@@ -19,3 +27,33 @@ def get_parser(bank: str):
     #     return parse_adcb
     else:
         return parse_generic   # fallback
+
+def parse_statement(file_path: str, password: str | None = None, bank: str | None = None):
+    """
+    Detect the bank and parse the statement, extracting the PDF text only once.
+    Detection reads just the first pages; the text-capable parsers reuse those
+    lines and only the remaining pages are extracted. Statements from banks that
+    can't be detected go to the generic parser.
+    """
+    bank = (bank or "").lower()
+    if bank == "emirates islamic":
+        bank = "emiratesislamic"
+
+    head = []
+    if not bank:
+        # Check first 2 pages (some banks show logos/headers differently)
+        head = extract_page_lines(file_path, password, stop=2)
+        if isinstance(head, dict) and "error" in head:
+            return head
+        for lines in head:
+            bank = detect_bank_from_text("\n".join(lines))
+            if bank:
+                break
+
+    if bank not in TEXT_PARSERS:
+        return get_parser(bank)(file_path, password)
+
+    rest = extract_page_lines(file_path, password, start=len(head))
+    if isinstance(rest, dict) and "error" in rest:
+        return rest
+    return TEXT_PARSERS[bank](head + rest)
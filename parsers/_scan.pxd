@@ -0,0 +1,7 @@
+cimport cython
+
+@cython.locals(
+    raw=str, desc=str, full_desc=str, buffer_desc=list, period_lines=list,
+    drop_flag=bint, amt_val=cython.double, debit=cython.double, credit=cython.double,
+)
+cpdef list scan_lines(list lines, tuple patterns, dict columns)
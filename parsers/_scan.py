@@ -0,0 +1,93 @@
+# RAKBANK per-line scan loop (line classification, description buffering and
+# the column appends), kept free of module globals so it compiles cleanly.
+#
+# Plain Python by default. With Cython installed it can be compiled in place
+# (`cythonize -i -3 parsers/_scan.py`); the static types live in _scan.pxd, and the
+# built extension module is picked up ahead of this file automatically.
+
+def scan_lines(lines: list, patterns: tuple, columns: dict) -> list:
+    """
+    Scan one page's (stripped, non-empty) lines and append its AED / FX
+    transactions to the column buffers, dates still unnormalized.
+    `patterns` holds the bound skip / period / aed / fx / drop / credit regex
+    methods and the amount cleaner (see rakbank._SCAN_PATTERNS). Lines that
+    are not transactions are buffered as the next transaction's description.
+    Returns the statement period lines, in order.
+    """
+    is_skip, is_period, match_aed, match_fx, is_drop, is_credit, to_amount = patterns
+    add_date = columns["transaction_date"].append
+    add_desc = columns["description"].append
+    add_debit = columns["debit"].append
+    add_credit = columns["credit"].append
+    add_amount = columns["amount"].append
+    period_lines = []
+    buffer_desc, drop_flag = [], False
+
+    for raw in lines:
+        if is_skip(raw):
+            continue
+
+        # statement period lines like 'Statement Period: 15/08/2025 TO 14/09/2025'
+        if is_period(raw):
+            period_lines.append(raw)
+            continue
+
+        # --------- AED transaction ----------
+        m = match_aed(raw)
+        if m:
+            date, desc, amt_raw, amt_cr, _balance_raw, bal_cr = m.groups()
+            if drop_flag:
+                buffer_desc.clear()
+
+            # buffered lines and desc are already stripped and non-empty
+            full_desc = " ".join(buffer_desc) + " " + desc if buffer_desc else desc
+            buffer_desc, drop_flag = [], False  # clear
+
+            amt_val = to_amount(amt_raw)
+
+            debit, credit = 0.0, 0.0
+            if amt_cr or bal_cr or is_credit(full_desc):
+                credit = amt_val
+            else:
+                debit = amt_val
+
+            add_date(date)
+            add_desc(full_desc)
+            add_debit(debit)
+            add_credit(credit)
+            add_amount(amt_val)
+            continue
+
+        # --------- FX transaction ----------
+        m = match_fx(raw)
+        if m:
+            # the FX currency/amount/rate columns are not part of the output schema
+            date, _ccy, _fx_amt, _fx_rate, aed_amt, cr_flag = m.groups()
+            if drop_flag:
+                buffer_desc.clear()
+
+            full_desc = " ".join(buffer_desc)
+            buffer_desc, drop_flag = [], False  # clear
+
+            amt_val = to_amount(aed_amt)
+
+            debit, credit = 0.0, 0.0
+            if cr_flag or is_credit(full_desc):
+                credit = amt_val
+            else:
+                debit = amt_val
+
+            add_date(date)
+            add_desc(full_desc)
+            add_debit(debit)
+            add_credit(credit)
+            add_amount(amt_val)
+            continue
+
+        # ---------- Non-transaction line ----------
+        # Header/footer lines (DROP_HINTS) discard the buffered description.
+        if not drop_flag and is_drop(raw):
+            drop_flag = True
+        buffer_desc.append(raw)
+
+    return period_lines
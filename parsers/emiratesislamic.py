@@ -1,21 +1,20 @@
 import re
 import datetime
-from common.pdf_utils import open_pdf_safe, normalize_transactions, summarize_transactions, normalize_date
+from calendar import monthrange
+from functools import lru_cache
+from common import fast_re
+from common.pdf_utils import (
+    extract_page_lines,
+    map_pages,
+    new_transaction_columns,
+    extend_transaction_columns,
+    columns_to_transactions,
+    summarize_columns,
+)
 
 BANK_NAME = "Emirates Islamic"
 CARD_TYPE = "credit"
 
-# Example: "14 AUG   12 AUG   RTA-ETISALAT DUBAI ARE   100.00"
-LINE_REGEX = re.compile(
-    r"^(\d{2}\s+[A-Z]{3})\s+(\d{2}\s+[A-Z]{3})\s+(.+?)\s+([\d,]+\.\d{2})(CR)?$",
-    re.IGNORECASE,
-)
-
-FROM_TO_REGEX = re.compile(
-    r"^\s*(From|To)\s*:?\s*(\d{1,2}(?:st|nd|rd|th)?\s+[A-Za-z]{3,9}\s+\d{4})\s*$",
-    re.IGNORECASE,
-)
-
 SKIP_KEYWORDS = [
     "opening balance",
     "primary card no",
@@ -30,18 +29,51 @@ SKIP_KEYWORDS = [
     "finance charges",
 ]
 
+MONTH_IDX = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}
+
+# From / To labels, including common Arabic renderings seen in PDFs (e.g. "ىلإ" for "To").
+RANGE_TOKENS = {
+    "from": "from",
+    "to": "to",
+    "من": "from",
+    "الى": "to",
+    "إلى": "to",
+    "ىلإ": "to",
+}
+_RANGE_ALT = "|".join(RANGE_TOKENS)
+
+# Lines containing any of these are skipped before the anchored patterns run.
+SKIP_RE = fast_re.compile("(?i)" + "|".join(map(re.escape, SKIP_KEYWORDS)))
+
+# From / To lines, e.g. "From:11th Jul 2025" / "To: 10 Aug 2025" (or an Arabic label)
+FROM_TO_REGEX = fast_re.compile(
+    r"(?i)^(" + _RANGE_ALT + r")\s*:?\s*(\d{1,2}(?:st|nd|rd|th)?\s+[A-Za-z]{3,9}\s+\d{4})$"
+)
+
+# Example: "14 AUG   12 AUG   RTA-ETISALAT DUBAI ARE   100.00"
+LINE_REGEX = fast_re.compile(
+    r"(?i)^\d{2}\s+[A-Z]{3}\s+(\d{2})\s+([A-Z]{3})\s+(.+?)\s+([\d,]+\.\d{2})(CR)?$"
+)
+
+# Thousands separators are deleted in one C-level pass; float() already
+# tolerates surrounding whitespace.
+_AMT_TABLE = str.maketrans("", "", ",")
+
 def clean_amount(val: str) -> float:
     if not val:
         return 0.0
-    v = val.replace(",", "").replace("CR", "").strip()
     try:
-        return float(v)
+        return float(val.translate(_AMT_TABLE).removesuffix("CR"))
     except ValueError:
         return 0.0
 
 def _strip_ordinal(s: str) -> str:
     return re.sub(r'(\d+)(st|nd|rd|th)', r'\1', s, flags=re.IGNORECASE).strip()
 
+@lru_cache(maxsize=4096)
 def _parse_full_date(s: str) -> str | None:
     # Accepts "11th Jul 2025" or "11 Jul 2025" etc. Returns ISO date string.
     s_clean = _strip_ordinal(s)
@@ -53,128 +85,159 @@ def _parse_full_date(s: str) -> str | None:
             continue
     return None
 
-def _normalize_range_token(raw: str) -> str | None:
-    token = raw.strip().strip(":").lower()
-    if not token:
-        return None
-    if token in {"from", "to"}:
-        return token
-    # Handle common Arabic renderings seen in PDFs (e.g. "ىلإ" for "To").
-    arabic_map = {
-        "من": "from",
-        "من ": "from",
-        "الى": "to",
-        "إلى": "to",
-        "ىلإ": "to",
-    }
-    return arabic_map.get(token)
-
-def parse_emiratesislamic(file_path: str, password: str | None = None):
-    transactions = []
+# Pending-range state at the start of a page: whatever the previous page left.
+_CARRY = "carry"
+
+def _parse_page(lines: list[str]):
+    """
+    Parse one page's (stripped, non-empty) lines. Returns (columns, day/months,
+    from_date, to_date, lead_date, pending_range). lead_date is a bare date line
+    found before any From/To label on the page; it completes a label left pending
+    at the end of the previous page. pending_range is _CARRY if the page had no
+    label at all.
+    """
+    columns = new_transaction_columns()
+    txn_day_months = []  # (day, month) per transaction, None if unparseable
     statement_from = None
     statement_to = None
+    pending_range = _CARRY
+    lead_date = None
+
+    # Local aliases for the per-line work: LOAD_FAST instead of global/attribute lookups.
+    is_skip = SKIP_RE.search
+    match_range = FROM_TO_REGEX.match
+    match_line = LINE_REGEX.match
+    range_token = RANGE_TOKENS.get
+    parse_full_date = _parse_full_date
+    to_amount = clean_amount
+    month_idx = MONTH_IDX.get
+    add_day_month = txn_day_months.append
+    add_desc = columns["description"].append
+    add_debit = columns["debit"].append
+    add_credit = columns["credit"].append
+    add_amount = columns["amount"].append
+
+    for raw in lines:
+        if is_skip(raw):
+            continue
+
+        # Look for From / To lines (e.g. "From:11th Jul 2025")
+        m_range = match_range(raw)
+        if m_range:
+            which, date_str = m_range.groups()
+            parsed = parse_full_date(date_str)
+            if parsed:
+                if RANGE_TOKENS[which.lower()] == "from":
+                    statement_from = parsed
+                else:
+                    statement_to = parsed
+            pending_range = None
+            continue
+
+        # A bare From / To label whose date is on a later line
+        normalized_range = range_token(raw.strip(":").lower())
+        if normalized_range:
+            if normalized_range == "from" and statement_from:
+                continue
+            if normalized_range == "to" and statement_to:
+                continue
+            pending_range = normalized_range
+            continue
 
-    pdf = open_pdf_safe(file_path, password)
-    if isinstance(pdf, dict) and "error" in pdf:
-        return pdf  # error dict
-
-    pending_range = None
-
-    with pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            for line in text.splitlines():
-                raw = line.strip()
-                if not raw:
-                    continue
-
-                low = raw.lower()
-                if any(k in low for k in SKIP_KEYWORDS):
-                    continue
-
-                # Look for From / To lines (e.g. "From:11th Jul 2025")
-                m_range = FROM_TO_REGEX.match(raw)
-                if m_range:
-                    which, date_str = m_range.groups()
-                    parsed = _parse_full_date(date_str)
-                    if parsed:
-                        if which.lower() == "from":
-                            statement_from = parsed
-                        else:
-                            statement_to = parsed
-                    pending_range = None
-                    continue
-
-                normalized_range = _normalize_range_token(raw)
-                if normalized_range:
-                    if normalized_range == "from" and statement_from:
-                        continue
-                    if normalized_range == "to" and statement_to:
-                        continue
-                    pending_range = normalized_range
-                    continue
-
-                if pending_range:
-                    parsed = _parse_full_date(raw)
-                    if parsed:
-                        if pending_range == "from":
-                            statement_from = parsed
-                        else:
-                            statement_to = parsed
-                        pending_range = None
-                        continue
-                    # If the line wasn't a recognizable date, keep the pending flag
-                    # so the next lines still have a chance to supply the date.
-
-                m = LINE_REGEX.match(raw)
-                if not m:
-                    continue
-
-                _, txn_date_raw, desc, amt_raw, cr = m.groups()
-                amt_val = clean_amount(amt_raw)
-
-                debit, credit = 0.0, 0.0
-                if cr or "payment received" in desc.lower():
-                    credit = amt_val
+        if pending_range:
+            parsed = parse_full_date(raw)
+            if parsed:
+                if pending_range == _CARRY:
+                    lead_date = parsed
+                elif pending_range == "from":
+                    statement_from = parsed
                 else:
-                    debit = amt_val
-
-                # Parse transaction date with just month and day
-                txn_date = normalize_date(txn_date_raw.strip(), "%d %b")
-                
-                # If we have from_date and to_date, determine the correct year
-                if statement_from and statement_to:
-                    from_year = int(statement_from[:4])
-                    to_year = int(statement_to[:4])
-                    
-                    # Convert string date to datetime object for comparison
-                    txn_dt = datetime.datetime.strptime(txn_date, "%Y-%m-%d").replace(year=to_year)
-                    
-                    # If the month is in the first few months of the statement and to_date is in the later months,
-                    # it likely means the transaction is from the previous year
-                    statement_to_dt = datetime.datetime.strptime(statement_to, "%Y-%m-%d")
-                    if statement_to_dt.month < 6 and txn_dt.month > 6:
-                        txn_date = txn_dt.replace(year=from_year).strftime("%Y-%m-%d")
-                    else:
-                        txn_date = txn_dt.strftime("%Y-%m-%d")
-                
-                transactions.append({
-                    "transaction_date": txn_date,
-                    "description": desc.strip(),
-                    "debit": debit,
-                    "credit": credit,
-                    "amount": amt_val,
-                    "bank": BANK_NAME,
-                    "card_type": CARD_TYPE,
-                })
-
-    normalized = normalize_transactions(transactions, BANK_NAME, CARD_TYPE)
+                    statement_to = parsed
+                pending_range = None
+                continue
+            # If the line wasn't a recognizable date, keep the pending flag
+            # so the next lines still have a chance to supply the date.
+
+        m = match_line(raw)
+        if not m:
+            continue
+        d_s, m_s, desc, amt_raw, cr = m.groups()
+        amt_val = to_amount(amt_raw)
+
+        debit, credit = 0.0, 0.0
+        if cr or "payment received" in desc.lower():
+            credit = amt_val
+        else:
+            debit = amt_val
+
+        # Transaction date is just day and month ("14 AUG"); the year is
+        # resolved against the statement range once all pages are read.
+        txn_month = month_idx(m_s.upper())
+        txn_day = int(d_s)
+        add_day_month((txn_day, txn_month) if txn_month and 1 <= txn_day <= 31 else None)
+
+        add_desc(desc)
+        add_debit(debit)
+        add_credit(credit)
+        add_amount(amt_val)
+
+    return columns, txn_day_months, statement_from, statement_to, lead_date, pending_range
+
+def _parse_text(pages: list[list[str]]):
+    """Parse already-extracted page lines (see common.pdf_utils.extract_page_lines)."""
+    columns = new_transaction_columns()
+    txn_day_months = []
+    froms, tos = [], []
+    carry = None  # From/To label still waiting for its date at the end of the last page
+    for page_columns, page_day_months, page_from, page_to, lead_date, pending in map_pages(_parse_page, pages):
+        extend_transaction_columns(columns, page_columns)
+        txn_day_months.extend(page_day_months)
+        if carry and lead_date:
+            (froms if carry == "from" else tos).append(lead_date)
+        froms.append(page_from)
+        tos.append(page_to)
+        if pending != _CARRY:
+            carry = pending
+    statement_from = next((d for d in froms if d), None)
+    statement_to = next((d for d in tos if d), None)
+
+    # If we have from_date and to_date, determine the correct year
+    if statement_from and statement_to:
+        from_year = int(statement_from[:4])
+        to_year = int(statement_to[:4])
+        # If to_date is in the first months of the year, transactions from the later
+        # months belong to the previous year (statement crossing new year).
+        to_month_lt_6 = int(statement_to[5:7]) < 6
+    else:
+        from_year = to_year = datetime.date.today().year
+        to_month_lt_6 = False
+
+    dates = columns["transaction_date"]
+    for day_month in txn_day_months:
+        if day_month is None:
+            dates.append("")
+            continue
+        txn_day, txn_month = day_month
+        year = from_year if to_month_lt_6 and txn_month > 6 else to_year
+        if txn_day > monthrange(year, txn_month)[1]:
+            # e.g. "31 APR", or "29 FEB" outside a leap year
+            dates.append("")
+            continue
+        dates.append(f"{year:04d}-{txn_month:02d}-{txn_day:02d}")
+
+    transactions = columns_to_transactions(columns, BANK_NAME, CARD_TYPE)
     result = {
         "bank": BANK_NAME,
         "card_type": CARD_TYPE,
-        "summary": summarize_transactions(normalized),
-        "transactions": normalized,
+        "summary": summarize_columns(columns),
+        "transactions": transactions,
         "from_date": statement_from,
         "to_date": statement_to,
     }
     return result
+
+def parse_emiratesislamic(file_path: str, password: str | None = None):
+    pages = extract_page_lines(file_path, password)
+    if isinstance(pages, dict) and "error" in pages:
+        return pages  # error dict
+    return _parse_text(pages)
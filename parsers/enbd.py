@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from common.pdf_utils import (
     open_pdf_safe,
     normalize_transactions,
@@ -6,6 +7,10 @@ from common.pdf_utils import (
     normalize_date,
 )
 
+# Transaction dates repeat across rows; the "%d%b%y" format carries the year,
+# so cached results never go stale.
+_nd = lru_cache(maxsize=2048)(normalize_date)
+
 BANK_NAME = "ENBD"
 CARD_TYPE = "debit"
 
@@ -14,6 +19,7 @@ CREDIT_HINTS = {
     "salary", "credit", "inward", "uaefts", "refund", "reversal",
     "ipp customer credit", "sdm deposit", "deposit", "tt ref", "customer credit"
 }
+CREDIT_HINTS_RE = re.compile("|".join(map(re.escape, sorted(CREDIT_HINTS))), re.IGNORECASE)
 
 DATE_RE = re.compile(r"^(\d{2}[A-Z]{3}\d{2})(?:\s+(.*))?$")  # e.g. 03AUG25 [desc?]
 AMOUNT_TAIL_RE = re.compile(
@@ -47,7 +53,7 @@ def _looks_credit(desc: str) -> bool:
     # avoid false positive for "credit card payment"
     if "credit card payment" in d:
         return False
-    return any(k in d for k in CREDIT_HINTS)
+    return CREDIT_HINTS_RE.search(d) is not None
 
 
 # ---------- MAIN PARSER ----------
@@ -139,7 +145,7 @@ def parse_enbd(file_path: str, password: str | None = None):
                         transactions.append(current)
 
                     current = {
-                        "transaction_date": normalize_date(m.group(1), "%d%b%y"),
+                        "transaction_date": _nd(m.group(1), "%d%b%y"),
                         "description": (m.group(2) or "").strip(),
                         "debit": 0.0,
                         "credit": 0.0,
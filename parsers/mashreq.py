@@ -6,15 +6,15 @@ from common.pdf_utils import open_pdf_safe, normalize_transactions, summarize_tr
 BANK_NAME = "Mashreq"
 CARD_TYPE = "credit"
 
+CREDIT_KEYWORDS = [
+    "inward", "credit", "uaefts", "payment received",
+    "refund", "reversal", "salary"
+]
+CREDIT_KEYWORDS_RE = re.compile("|".join(map(re.escape, CREDIT_KEYWORDS)), re.IGNORECASE)
+
 def classify_transaction(desc: str, amount: float):
-    desc_lower = desc.lower()
-    credit_keywords = [
-        "inward", "credit", "uaefts", "payment received",
-        "refund", "reversal", "salary"
-    ]
-    for kw in credit_keywords:
-        if kw in desc_lower:
-            return 0.0, amount
+    if CREDIT_KEYWORDS_RE.search(desc):
+        return 0.0, amount
     return amount, 0.0
 
 ROW_PATTERN = re.compile(
@@ -70,6 +70,12 @@ def parse_mashreq(file_path: str, password: str | None = None):
                                 pass
                     # don't break; there might be multiple pages/lines — continue scanning
 
+            # statement range is settled for this page; parse it once, not per row
+            if statement_from and statement_to:
+                from_year = int(statement_from[:4])
+                to_year = int(statement_to[:4])
+                statement_to_month = int(statement_to[5:7])
+
             for match in ROW_PATTERN.finditer(text):
                 t_date, p_date, desc, amount = match.groups()
                 value = float(amount.replace(",", ""))
@@ -85,12 +91,9 @@ def parse_mashreq(file_path: str, password: str | None = None):
                     txn_dt = datetime.datetime.strptime(t_date, "%d/%m")
 
                 if statement_from and statement_to:
-                    from_year = int(statement_from[:4])
-                    to_year = int(statement_to[:4])
                     # apply to_year then handle year rollover similar to other parsers
                     txn_dt = txn_dt.replace(year=to_year)
-                    statement_to_dt = datetime.datetime.strptime(statement_to, "%Y-%m-%d")
-                    if statement_to_dt.month < 6 and txn_dt.month > 6:
+                    if statement_to_month < 6 and txn_dt.month > 6:
                         txn_dt = txn_dt.replace(year=from_year)
                 else:
                     # ensure year is set (normalize_date may have filled it already)
@@ -1,28 +1,39 @@
 import re
 import datetime
-from common.pdf_utils import open_pdf_safe, normalize_transactions, summarize_transactions, normalize_date
+from common import fast_re
+from ._scan import scan_lines
+from common.pdf_utils import (
+    extract_page_lines,
+    normalize_date,
+    normalize_dates,
+    map_pages,
+    new_transaction_columns,
+    extend_transaction_columns,
+    columns_to_transactions,
+    summarize_columns,
+)
 
 BANK_NAME = "RAKBANK"
 CARD_TYPE = "credit"
 
-STATEMENT_PERIOD_RE = re.compile(r"(\d{1,2}/\d{1,2}/\d{4})\s*(?:to|TO|To)\s*(\d{1,2}/\d{1,2}/\d{4})")
+STATEMENT_PERIOD_RE = fast_re.compile(r"(\d{1,2}/\d{1,2}/\d{4})\s*(?:to|TO|To)\s*(\d{1,2}/\d{1,2}/\d{4})")
+
+STATEMENT_PERIOD_LABEL_RE = fast_re.compile(r"(?i)statement period")
 
 # AED transaction
-RAKBANK_LINE_REGEX = re.compile(
-r"^(\d{2}/\d{2}/\d{4})\s+" # date
-r"(.+?)\s+" # description (lazy)
+RAKBANK_LINE_REGEX = fast_re.compile(
+r"(?i)^(\d{2}/\d{2}/\d{4})\s+" # date
+r"(\S(?:.*?\S)?)\s+" # description (lazy, starts and ends on non-space)
 r"AED\s+" # currency
 r"([\d,]+.\d{2})" # amount
 r"(?:\s*((?:CR|Cr)))?\s+" # optional CR after amount (capture)
 r"-\s+" # separator dash
 r"([\d,]+.\d{2})" # balance
-r"(?:\s*((?:CR|Cr)))?\s*$", # optional CR after balance (capture)
-re.IGNORECASE,
+r"(?:\s*((?:CR|Cr)))?\s*$" # optional CR after balance (capture)
 )
 # FX transaction
-RAKBANK_FX_REGEX = re.compile(
-    r"^(\d{2}/\d{2}/\d{4})\s+([A-Z]{3})\s+([\d,]+\.\d{2})\s+([\d,]+\.\d{2})\s+([\d,]+\.\d{2})(?:\s*(CR|Cr))?$",
-    re.IGNORECASE,
+RAKBANK_FX_REGEX = fast_re.compile(
+    r"(?i)^(\d{2}/\d{2}/\d{4})\s+([A-Z]{3})\s+([\d,]+\.\d{2})\s+([\d,]+\.\d{2})\s+([\d,]+\.\d{2})(?:\s*(CR|Cr))?$"
 )
 
 SKIP_KEYWORDS = [
@@ -33,6 +44,7 @@ SKIP_KEYWORDS = [
     "payment due date",
     "credit limit",
 ]
+SKIP_RE = fast_re.compile("(?i)" + "|".join(map(re.escape, SKIP_KEYWORDS)))
 
 DROP_HINTS = (
     "your credit card statement",
@@ -41,118 +53,67 @@ DROP_HINTS = (
     "card number",
     "page[",
 )
+DROP_RE = fast_re.compile("(?i)" + "|".join(map(re.escape, DROP_HINTS)))
+
+CREDIT_DESC_RE = fast_re.compile(r"(?i)payment|refund")
+
+_AMT_TABLE = str.maketrans("", "", ",")
 
 def clean_amount(val: str | None) -> float:
     if not val:
         return 0.0
-    return float(val.replace(",", "").replace("CR", "").replace("Cr", "").strip())
+    return float(val.translate(_AMT_TABLE).removesuffix("CR").removesuffix("Cr"))
+
+# Everything scan_lines needs per line, bound once (see parsers/_scan.py)
+_SCAN_PATTERNS = (
+    SKIP_RE.search,
+    STATEMENT_PERIOD_LABEL_RE.search,
+    RAKBANK_LINE_REGEX.match,
+    RAKBANK_FX_REGEX.match,
+    DROP_RE.search,
+    CREDIT_DESC_RE.search,
+    clean_amount,
+)
 
-def parse_rakbank(file_path: str, password: str | None = None):
-    transactions = []
+def _parse_page(lines: list[str]):
+    """Parse one page's (stripped, non-empty) lines. Returns (columns, from_date, to_date)."""
+    columns = new_transaction_columns()
     statement_from = None
     statement_to = None
-    pdf = open_pdf_safe(file_path, password)
-    if isinstance(pdf, dict) and "error" in pdf:
-        return pdf  # error dict
-
-    with pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-
-            buffer_desc = []
-
-            for raw in lines:
-                low = raw.lower()
-                if any(k in low for k in SKIP_KEYWORDS):
-                    continue
-
-                # detect statement period lines like 'Statement Period: 15/08/2025 TO 14/09/2025'
-                if "statement period" in low:
-                    m = STATEMENT_PERIOD_RE.search(raw)
-                    if m:
-                        fd, td = m.groups()
-                        statement_from = normalize_date(fd.replace(" ", ""), "%d/%m/%Y")
-                        statement_to = normalize_date(td.replace(" ", ""), "%d/%m/%Y")
-                    continue
-
-                # --------- AED transaction ----------
-                m = RAKBANK_LINE_REGEX.match(raw)
-                if m:
-                    date, desc, amt_raw, amt_cr, balance_raw, bal_cr = m.groups()
-                    if any(h in " ".join(buffer_desc).lower() for h in DROP_HINTS):
-                        buffer_desc = []
-
-                    full_desc = " ".join(buffer_desc + [desc.strip()]).strip()
-                    buffer_desc = []  # clear
-
-                    amt_val = clean_amount(amt_raw)
-                    balance_val = clean_amount(balance_raw)
-
-                    debit, credit = 0.0, 0.0
-                    desc_low = full_desc.lower()
-                    has_cr_flag = bool(amt_cr) or bool(bal_cr)
-                    if has_cr_flag or ("payment" in desc_low or "refund" in desc_low):
-                     credit = amt_val
-                    else:
-                     debit = amt_val
-
-                    transactions.append({
-                        "transaction_date": normalize_date(date, "%d/%m/%Y"),
-                        "description": full_desc,
-                        "debit": debit,
-                        "credit": credit,
-                        "amount": amt_val,
-                        "balance": balance_val,
-                        "bank": BANK_NAME,
-                        "card_type": CARD_TYPE,
-                    })
-                    continue
-
-                # --------- FX transaction ----------
-                mfx = RAKBANK_FX_REGEX.match(raw)
-                if mfx:
-                    date, ccy, fx_amt, fx_rate, aed_amt, cr_flag = mfx.groups()
-                    if any(h in " ".join(buffer_desc).lower() for h in DROP_HINTS):
-                        buffer_desc = []
-
-                    full_desc = " ".join(buffer_desc).strip()
-                    buffer_desc = []  # clear
-
-                    fx_amt_val = clean_amount(fx_amt)
-                    fx_rate_val = clean_amount(fx_rate)
-                    aed_val = clean_amount(aed_amt)
-
-                    debit, credit = 0.0, 0.0
-                    desc_low = full_desc.lower()
-                    if cr_flag or ("payment" in desc_low or "refund" in desc_low):
-                        credit = aed_val
-                    else:
-                        debit = aed_val
-
-                    transactions.append({
-                        "transaction_date": normalize_date(date, "%d/%m/%Y"),
-                        "description": full_desc,
-                        "debit": debit,
-                        "credit": credit,
-                        "amount": aed_val,
-                        "bank": BANK_NAME,
-                        "card_type": CARD_TYPE,
-                        # extra FX info (ignored in normalized output)
-                        "fx_currency": ccy,
-                        "fx_amount": fx_amt_val,
-                        "fx_rate": fx_rate_val,
-                    })
-                    continue
-
-                # ---------- Non-transaction line ----------
-                buffer_desc.append(raw)
-    normalized = normalize_transactions(transactions, BANK_NAME, CARD_TYPE)
+
+    for raw in scan_lines(lines, _SCAN_PATTERNS, columns):
+        m = STATEMENT_PERIOD_RE.search(raw)
+        if m:
+            fd, td = m.groups()
+            statement_from = normalize_date(fd.replace(" ", ""), "%d/%m/%Y")
+            statement_to = normalize_date(td.replace(" ", ""), "%d/%m/%Y")
+
+    return columns, statement_from, statement_to
+
+def _parse_text(pages: list[list[str]]):
+    """Parse already-extracted page lines (see common.pdf_utils.extract_page_lines)."""
+    columns = new_transaction_columns()
+    froms, tos = [], []
+    for page_columns, page_from, page_to in map_pages(_parse_page, pages):
+        extend_transaction_columns(columns, page_columns)
+        froms.append(page_from)
+        tos.append(page_to)
+    statement_from = next((d for d in froms if d), None)
+    statement_to = next((d for d in tos if d), None)
+
+    columns["transaction_date"] = normalize_dates(columns["transaction_date"], "%d/%m/%Y")
+    transactions = columns_to_transactions(columns, BANK_NAME, CARD_TYPE)
     return {
         "bank": BANK_NAME,
         "card_type": CARD_TYPE,
-        "summary": summarize_transactions(normalized),
-        "transactions": normalized,
+        "summary": summarize_columns(columns),
+        "transactions": transactions,
         "from_date": statement_from,
         "to_date": statement_to,
-    }
\ No newline at end of file
+    }
+
+def parse_rakbank(file_path: str, password: str | None = None):
+    pages = extract_page_lines(file_path, password)
+    if isinstance(pages, dict) and "error" in pages:
+        return pages  # error dict
+    return _parse_text(pages)